@@ -1,9 +1,13 @@
+import hashlib
 import json
 import os
 from datetime import date, datetime
+from app.backend.stats_service import build_stats, empty_stats
 
 # Define the path to the JSON file
 DATA_FILE = os.path.join(os.path.dirname(__file__), "../frontend/data/tasks.json")
+# Dashboard counters are persisted next to the tasks
+STATS_FILE = os.path.join(os.path.dirname(__file__), "../frontend/data/stats.json")
 
 def load_tasks():
     """Loads tasks from the JSON file and converts dates back to objects."""
@@ -23,8 +27,36 @@ def load_tasks():
     except (json.JSONDecodeError, FileNotFoundError):
         return []
 
-def save_tasks(tasks):
-    """Converts dates to strings and saves tasks to the JSON file."""
+def _fingerprint(payload):
+    return hashlib.sha1(payload).hexdigest()
+
+def _write_atomic(path, payload):
+    """Writes to a temp file and swaps it in, so a crash never leaves a half-written file."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+def _stats_are_valid(stats):
+    template = empty_stats()
+    return isinstance(stats, dict) and all(isinstance(stats.get(k), type(v)) for k, v in template.items())
+
+def load_stats(tasks):
+    """Loads the dashboard counters, rebuilding them if missing, malformed,
+    or saved for a different version of the task file."""
+    try:
+        with open(DATA_FILE, "rb") as f:
+            fingerprint = _fingerprint(f.read())
+        with open(STATS_FILE, "r") as f:
+            stats = json.load(f)
+        if _stats_are_valid(stats) and stats.get("fingerprint") == fingerprint:
+            return stats
+    except (json.JSONDecodeError, FileNotFoundError):
+        pass
+    return build_stats(tasks)
+
+def save_tasks(tasks, stats=None):
+    """Converts dates to strings and saves tasks (and the dashboard counters, if given) to JSON."""
     tasks_to_save = []
 
     for t in tasks:
@@ -40,5 +72,10 @@ def save_tasks(tasks):
     # Ensure directory exists
     os.makedirs(os.path.dirname(DATA_FILE), exist_ok=True)
 
-    with open(DATA_FILE, "w") as f:
-        json.dump(tasks_to_save, f, indent=4)
\ No newline at end of file
+    payload = json.dumps(tasks_to_save, indent=4).encode("utf-8")
+    _write_atomic(DATA_FILE, payload)
+
+    if stats is not None:
+        # Tie the counters to this exact task file; load_stats rebuilds on any mismatch
+        stats["fingerprint"] = _fingerprint(payload)
+        _write_atomic(STATS_FILE, json.dumps(stats, indent=4).encode("utf-8"))
@@ -0,0 +1,367 @@
+import re
+from datetime import datetime, timedelta, timezone
+from itertools import islice, takewhile
+from dateutil.rrule import rrulestr
+from app.backend.stats_service import add_task, remove_task
+
+# Recurring events with no COUNT/UNTIL are expanded this far past today (or their first date, if later)
+RECURRENCE_HORIZON = timedelta(weeks=16)
+# Hard cap per recurring event, so a rule like FREQ=MINUTELY;COUNT=100000 can't flood the task file
+MAX_OCCURRENCES = 500
+# Frequencies with a fixed period, used to fast-forward open-ended rules to today
+FIXED_PERIODS = {
+    "SECONDLY": timedelta(seconds=1),
+    "MINUTELY": timedelta(minutes=1),
+    "HOURLY": timedelta(hours=1),
+    "DAILY": timedelta(days=1),
+    "WEEKLY": timedelta(weeks=1),
+}
+
+# Keyword -> module, checked in order against the event summary/categories
+MODULE_KEYWORDS = [
+    ("Exam", ("exam", "midterm", "final", "test", "quiz", "assessment")),
+    ("Lecture", ("lecture", "class", "seminar", "tutorial", "lab", "workshop", "practical")),
+    ("Gym", ("gym", "sport", "training", "run", "swim")),
+    ("Break", ("break", "lunch", "holiday", "vacation")),
+]
+# Whole words only (plurals allowed), so "Latest" isn't an exam and "Brunch" isn't a run
+MODULE_PATTERNS = [
+    (module, re.compile(r"\b(?:%s)(?:s|es)?\b" % "|".join(keywords)))
+    for module, keywords in MODULE_KEYWORDS
+]
+
+
+def _unfold(lines):
+    """Yields logical content lines, joining RFC 5545 folded continuations.
+    Folds are joined as bytes before decoding, since a fold can split a multibyte character."""
+    current = None
+    for raw in lines:
+        if isinstance(raw, str):
+            raw = raw.encode("utf-8")
+        raw = raw.rstrip(b"\r\n")
+        if raw[:1] in (b" ", b"\t"):
+            if current is not None:
+                current += raw[1:]
+            continue
+        if current:
+            yield current.decode("utf-8-sig", errors="replace")
+        current = raw
+    if current:
+        yield current.decode("utf-8-sig", errors="replace")
+
+
+PARAM_PATTERN = re.compile(r';([^=;:"]+)=("[^"]*"|[^;:"]*)')
+
+
+def _split_line(line):
+    """Splits 'NAME;PARAM=X:VALUE' into (name, params, value).
+    Quoted parameter values (e.g. ALTREP="http://...") may contain ':' and ';'."""
+    if '"' in line:
+        in_quotes = False
+        for i, ch in enumerate(line):
+            if ch == '"':
+                in_quotes = not in_quotes
+            elif ch == ":" and not in_quotes:
+                break
+        else:
+            i = len(line)
+        head, value = line[:i], line[i + 1:]
+    else:
+        head, _, value = line.partition(":")
+    name, _, params = head.partition(";")
+    param_map = {}
+    if params:
+        for key, val in PARAM_PATTERN.findall(";" + params):
+            param_map[key.upper()] = val.strip('"')
+    return name.upper(), param_map, value
+
+
+def _unescape(text):
+    return (text.replace("\\n", "\n").replace("\\N", "\n")
+                .replace("\\,", ",").replace("\\;", ";").replace("\\\\", "\\"))
+
+
+def _parse_dt(value, params):
+    """Parses an iCal date/date-time into a naive local datetime (the app stores naive times)."""
+    if params.get("VALUE") == "DATE" or len(value) == 8:
+        return datetime.strptime(value[:8], "%Y%m%d"), True
+    if value.endswith("Z"):
+        dt = datetime.strptime(value[:-1], "%Y%m%dT%H%M%S").replace(tzinfo=timezone.utc)
+        return dt.astimezone().replace(tzinfo=None), False
+    # TZID times are kept as wall-clock time, which is what the timetable shows
+    return datetime.strptime(value[:15], "%Y%m%dT%H%M%S"), False
+
+
+def iter_events(lines):
+    """Streams VEVENTs from an iterable of .ics lines as plain dicts, one at a time.
+    Raises ValueError if the input turns out not to be a calendar at all."""
+    event = None
+    depth = 0
+    is_calendar = False
+    for line in _unfold(lines):
+        name, params, value = _split_line(line)
+        if name == "BEGIN":
+            if value.upper() == "VCALENDAR":
+                is_calendar = True
+            elif value.upper() == "VEVENT":
+                event = {"exdates": set()}
+                depth = 0
+            elif event is not None:
+                depth += 1  # nested component, e.g. VALARM
+            continue
+        if name == "END":
+            if event is None:
+                continue
+            if depth:
+                depth -= 1
+            elif value.upper() == "VEVENT":
+                yield event
+                event = None
+            continue
+        if event is None or depth:
+            continue
+
+        try:
+            _read_property(event, name, params, value)
+        except ValueError:
+            event["invalid"] = True
+
+    if not is_calendar:
+        raise ValueError("no BEGIN:VCALENDAR found, this is not an .ics calendar file")
+
+
+def _read_property(event, name, params, value):
+    if name == "UID":
+        event["uid"] = value
+    elif name == "SUMMARY":
+        event["summary"] = _unescape(value)
+    elif name == "DESCRIPTION":
+        event["description"] = _unescape(value)
+    elif name == "LOCATION":
+        event["location"] = _unescape(value)
+    elif name == "CATEGORIES":
+        event["categories"] = _unescape(value)
+    elif name == "DTSTART":
+        event["start"], event["all_day"] = _parse_dt(value, params)
+    elif name == "DTEND":
+        event["end"], _ = _parse_dt(value, params)
+    elif name == "DURATION":
+        event["duration"] = value
+    elif name == "RRULE":
+        event["rrule"] = value
+    elif name == "EXDATE":
+        for v in value.split(","):
+            event["exdates"].add(_parse_dt(v, params)[0])
+    elif name == "RECURRENCE-ID":
+        event["recurrence_id"], _ = _parse_dt(value, params)
+    elif name == "STATUS":
+        event["status"] = value.upper()
+
+
+def _parse_duration(value):
+    """Parses an iCal DURATION such as PT1H30M or P1D."""
+    sign = -1 if value.startswith("-") else 1
+    value = value.lstrip("+-").lstrip("P")
+    days = seconds = 0
+    number = ""
+    in_time = False
+    for ch in value:
+        if ch == "T":
+            in_time = True
+        elif ch.isdigit():
+            number += ch
+        else:
+            n = int(number or 0)
+            number = ""
+            if ch == "W":
+                days += n * 7
+            elif ch == "D":
+                days += n
+            elif ch == "H" and in_time:
+                seconds += n * 3600
+            elif ch == "M" and in_time:
+                seconds += n * 60
+            elif ch == "S" and in_time:
+                seconds += n
+    return sign * timedelta(days=days, seconds=seconds)
+
+
+def infer_module(summary, categories=""):
+    """Guesses the task module from the event title and categories."""
+    text = f"{categories} {summary}".lower()
+    for module, pattern in MODULE_PATTERNS:
+        if pattern.search(text):
+            return module
+    return "Other"
+
+
+def _occurrences(event):
+    """Yields the start datetimes of an event, expanding RRULE if present."""
+    start = event["start"]
+    if "rrule" not in event:
+        yield start
+        return
+    rule_text = event["rrule"].upper()
+    parts = dict(part.partition("=")[::2] for part in rule_text.split(";"))
+    interval = parts.get("INTERVAL", "1")
+    # dateutil loops forever on INTERVAL=0
+    if not interval.isdigit() or int(interval) < 1:
+        raise ValueError(f"invalid INTERVAL: {interval!r}")
+
+    if "COUNT" in parts or "UNTIL" in parts:
+        occurrences = iter(rrulestr(rule_text, dtstart=start, ignoretz=True))
+    else:
+        # Open-ended rules (e.g. a weekly class that started years ago) are expanded for the current term
+        today = datetime.combine(datetime.now().date(), datetime.min.time())
+        anchor = max(start, today)
+        step = FIXED_PERIODS.get(parts.get("FREQ"))
+        if step:
+            # Jump ahead by whole periods so dateutil doesn't walk every occurrence since DTSTART
+            step *= int(interval)
+            start += (anchor - start) // step * step
+        rule = rrulestr(rule_text, dtstart=start, ignoretz=True)
+        end = anchor + RECURRENCE_HORIZON
+        occurrences = takewhile(lambda occ: occ <= end, rule.xafter(anchor, inc=True))
+    # Both kinds are generated lazily and capped, so huge COUNT/UNTIL values stay cheap
+    for occ in islice(occurrences, MAX_OCCURRENCES):
+        if occ not in event["exdates"]:
+            yield occ
+
+
+def events_to_tasks(events, skipped=None):
+    """Maps streamed events to task dicts, deduplicated by UID (+ occurrence for recurrences).
+    Events that fail to parse are left out and their titles appended to `skipped`, if given."""
+    seen = set()
+    overrides = {}
+    cancelled = set()
+    for event in events:
+        summary = event.get("summary", "Untitled Event")
+        if event.get("invalid") or "start" not in event:
+            if skipped is not None:
+                skipped.append(summary)
+            continue
+
+        uid = event.get("uid") or f"{summary}|{event['start'].isoformat()}"
+        if event.get("status") == "CANCELLED":
+            if "recurrence_id" in event:
+                # A cancelled instance suppresses that occurrence of the master RRULE
+                key = f"{uid}|{event['recurrence_id'].isoformat()}"
+            elif "rrule" not in event:
+                key = uid
+            else:
+                # A cancelled series drops every occurrence it would have produced
+                try:
+                    keys = [f"{uid}|{occ.isoformat()}" for occ in _occurrences(event)]
+                except ValueError:
+                    if skipped is not None:
+                        skipped.append(summary)
+                    continue
+                for key in keys:
+                    seen.add(key)
+                    overrides.pop(f"ics:{key}", None)
+                    cancelled.add(f"ics:{key}")
+                continue
+            seen.add(key)
+            overrides.pop(f"ics:{key}", None)
+            cancelled.add(f"ics:{key}")
+            continue
+
+        if event.get("end"):
+            length = event["end"] - event["start"]
+        elif event.get("duration"):
+            length = _parse_duration(event["duration"])
+        else:
+            length = timedelta(days=1) if event["all_day"] else timedelta(hours=1)
+
+        notes = []
+        if event.get("location"):
+            notes.append(f"Room: {event['location']}")
+        if event.get("description"):
+            notes.append(event["description"])
+
+        recurring = "rrule" in event or "recurrence_id" in event
+        module = infer_module(summary, event.get("categories", ""))
+
+        try:
+            occurrences = list(_occurrences(event))
+        except ValueError:
+            if skipped is not None:
+                skipped.append(summary)
+            continue
+
+        for occ in occurrences:
+            key = uid
+            if recurring:
+                key = f"{uid}|{(event.get('recurrence_id') or occ).isoformat()}"
+            task = {
+                "id": f"ics:{key}",
+                "name": summary,
+                "priority": "high" if module == "Exam" else "medium",
+                "module": module,
+                "completed": False,
+                "start_time": occ.isoformat(),
+                "end_time": (occ + length).isoformat(),
+                "notes": " | ".join(notes),
+            }
+            if "recurrence_id" in event:
+                # A modified instance replaces the occurrence generated by the master RRULE
+                if f"ics:{key}" not in cancelled:
+                    overrides[task["id"]] = task
+                seen.add(key)
+            elif key not in seen:
+                seen.add(key)
+                yield task
+    # Overrides are flagged so merge_imported_tasks can replace a previously imported copy
+    for task in overrides.values():
+        yield dict(task, _override=True)
+    # ...and cancellations so it can drop one
+    for task_id in cancelled:
+        yield {"id": task_id, "_cancelled": True}
+
+
+def parse_ics_file(source):
+    """Parses an .ics file (bytes, str, or an open file) into a list of task dicts.
+    Returns (tasks, skipped) where skipped lists the titles of events that could not be read.
+    Raises ValueError if the file is not an iCalendar file."""
+    if isinstance(source, (bytes, str)):
+        source = source.splitlines()
+    skipped = []
+    tasks = list(events_to_tasks(iter_events(source), skipped))
+    return tasks, skipped
+
+
+def merge_imported_tasks(tasks, imported, stats=None):
+    """Adds imported tasks to the list in place, skipping IDs that already exist.
+    Keeps the dashboard counters in step if given.
+    Returns the newly added tasks so the caller can save once."""
+    index = {t.get("id"): i for i, t in enumerate(tasks)}
+    added = []
+    removed = set()
+    for t in imported:
+        if t.get("_cancelled"):
+            removed.add(t["id"])
+            continue
+        override = t.pop("_override", False)
+        i = index.get(t["id"])
+        if i is None:
+            index[t["id"]] = len(tasks)
+            tasks.append(t)
+            added.append(t)
+            if stats is not None:
+                add_task(stats, t)
+        elif override and not tasks[i].get("completed"):
+            if stats is not None:
+                remove_task(stats, tasks[i])
+            tasks[i].update(t)
+            if stats is not None:
+                add_task(stats, tasks[i])
+
+    removed.intersection_update(index)
+    if removed:
+        # Cancelled sessions are dropped in one pass rather than one list.remove() each
+        for t in tasks:
+            if t.get("id") in removed and stats is not None:
+                remove_task(stats, t)
+        tasks[:] = [t for t in tasks if t.get("id") not in removed]
+        added = [t for t in added if t["id"] not in removed]
+    return added
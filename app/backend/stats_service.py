@@ -0,0 +1,35 @@
+def empty_stats():
+    """Counters backing the dashboard. by_module / by_day only count pending tasks."""
+    return {"total": 0, "completed": 0, "by_module": {}, "by_day": {}}
+
+def _bump(counter, key, delta):
+    value = counter.get(key, 0) + delta
+    if value > 0:
+        counter[key] = value
+    else:
+        counter.pop(key, None)  # Keep the stored file free of zero entries
+
+def _apply(stats, task, delta):
+    stats["total"] += delta
+    if task.get('completed'):
+        stats["completed"] += delta
+        return
+    _bump(stats["by_module"], task.get('module', 'Other'), delta)
+    day = (task.get('start_time') or '')[:10]
+    if day:
+        _bump(stats["by_day"], day, delta)
+
+def add_task(stats, task):
+    """Counts a task that was just added (O(1))."""
+    _apply(stats, task, 1)
+
+def remove_task(stats, task):
+    """Uncounts a task. Call this BEFORE mutating a task, then add_task after."""
+    _apply(stats, task, -1)
+
+def build_stats(tasks):
+    """Full rebuild, only used when the stored counters are missing or out of sync."""
+    stats = empty_stats()
+    for t in tasks:
+        add_task(stats, t)
+    return stats
@@ -15,8 +15,10 @@ from streamlit_option_menu import option_menu
 from streamlit_calendar import calendar
 
 # Backend Imports
-from app.backend.data_service import load_tasks, save_tasks
+from app.backend.data_service import load_tasks, load_stats, save_tasks
 from app.backend.export_service import generate_ics_file
+from app.backend.import_service import parse_ics_file, merge_imported_tasks
+from app.backend.stats_service import add_task, remove_task
 
 # --- PAGE CONFIG ---
 st.set_page_config(page_title="ScheduleSmart Pro", page_icon="🎓", layout="wide")
@@ -49,6 +51,8 @@ st.markdown("""
 def main():
     if "tasks" not in st.session_state:
         st.session_state.tasks = load_tasks()
+    if "stats" not in st.session_state:
+        st.session_state.stats = load_stats(st.session_state.tasks)
 
     with st.sidebar:
         # --- LOGO LOGIC (Updated for .jpg) ---
@@ -77,16 +81,14 @@ def main():
 
         # Pie Chart
         st.caption("📊 Work Breakdown")
-        active_tasks = [t for t in st.session_state.tasks if not t.get('completed')]
-        if active_tasks:
-            df = pd.DataFrame(active_tasks)
-            if 'module' in df.columns:
-                fig, ax = plt.subplots(figsize=(2, 2))
-                colors = ['#3182CE', '#805AD5', '#E53E3E', '#48BB78', '#ED8936']
-                df['module'].value_counts().plot.pie(autopct='%1.0f%%', colors=colors, ax=ax, textprops={'fontsize': 8})
-                ax.set_ylabel('')
-                fig.patch.set_alpha(0)
-                st.pyplot(fig, use_container_width=False)
+        module_counts = st.session_state.stats["by_module"]
+        if module_counts:
+            fig, ax = plt.subplots(figsize=(2, 2))
+            colors = ['#3182CE', '#805AD5', '#E53E3E', '#48BB78', '#ED8936']
+            pd.Series(module_counts).sort_values(ascending=False).plot.pie(autopct='%1.0f%%', colors=colors, ax=ax, textprops={'fontsize': 8})
+            ax.set_ylabel('')
+            fig.patch.set_alpha(0)
+            st.pyplot(fig, use_container_width=False)
 
     if selected == "Dashboard":
         render_dashboard()
@@ -103,13 +105,13 @@ def main():
 def render_dashboard():
     st.title("👋 Welcome back")
 
-    active_tasks = [t for t in st.session_state.tasks if not t.get('completed')]
+    stats = st.session_state.stats
 
-    urgent_exams = [t for t in active_tasks if t.get('module') == 'Exam']
-    if urgent_exams:
-        st.markdown(f"""<div class="urgency-banner">🔥 HEADS UP: You have {len(urgent_exams)} upcoming Exam(s)!</div>""", unsafe_allow_html=True)
+    exam_count = stats["by_module"].get('Exam', 0)
+    if exam_count:
+        st.markdown(f"""<div class="urgency-banner">🔥 HEADS UP: You have {exam_count} upcoming Exam(s)!</div>""", unsafe_allow_html=True)
 
-    if not st.session_state.tasks:
+    if not stats["total"]:
         st.info("Your schedule is empty.")
         if st.button("🚀 Load Sample Data (Demo)"):
             load_sample_data()
@@ -117,15 +119,16 @@ def render_dashboard():
         return
 
     c1, c2, c3 = st.columns(3)
-    today_str = date.today().isoformat()
-    today_count = len([t for t in active_tasks if t['start_time'].startswith(today_str)])
-    completed_count = len([t for t in st.session_state.tasks if t.get('completed')])
+    today_count = stats["by_day"].get(date.today().isoformat(), 0)
+    pending_count = stats["total"] - stats["completed"]
+    completed_count = stats["completed"]
 
     with c1: st.markdown(f"""<div class="metric-card"><div class="metric-value">{today_count}</div><div class="metric-label">📅 Tasks Today</div></div>""", unsafe_allow_html=True)
-    with c2: st.markdown(f"""<div class="metric-card"><div class="metric-value">{len(active_tasks)}</div><div class="metric-label">📂 Total Pending</div></div>""", unsafe_allow_html=True)
+    with c2: st.markdown(f"""<div class="metric-card"><div class="metric-value">{pending_count}</div><div class="metric-label">📂 Total Pending</div></div>""", unsafe_allow_html=True)
     with c3: st.markdown(f"""<div class="metric-card"><div class="metric-value" style="color: #48BB78;">{completed_count}</div><div class="metric-label">✅ Completed</div></div>""", unsafe_allow_html=True)
 
     st.markdown("### 📝 Up Next")
+    active_tasks = [t for t in st.session_state.tasks if not t.get('completed')]
     sorted_tasks = sorted(active_tasks, key=lambda x: x['start_time'])
     for t in sorted_tasks:
         render_task_card(t)
@@ -175,8 +178,10 @@ def run_focus_mode(task_name):
     time.sleep(1)
 
 def mark_complete(task):
+    remove_task(st.session_state.stats, task)
     task['completed'] = True
-    save_tasks(st.session_state.tasks)
+    add_task(st.session_state.stats, task)
+    save_tasks(st.session_state.tasks, st.session_state.stats)
     st.rerun()
 
 # ==========================================
@@ -185,7 +190,7 @@ def mark_complete(task):
 def render_add_task():
     st.title("➕ Add to Calendar")
 
-    tab1, tab2, tab3, tab4 = st.tabs(["📝 Task", "🏫 Class", "🚨 Exam", "🏃 Personal"])
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(["📝 Task", "🏫 Class", "🚨 Exam", "🏃 Personal", "📥 Import"])
 
     # 1. TASK FORM
     with tab1:
@@ -270,6 +275,16 @@ def render_add_task():
             if st.form_submit_button("Add Activity", type="primary"):
                 create_task(name, cat, "Personal", p_date, start_t, end_t, notes)
 
+    # 5. CALENDAR IMPORT
+    with tab5:
+        with st.form("form_import"):
+            st.subheader("Import Timetable")
+            st.caption("Upload an .ics export from your university or another calendar app.")
+            ics_file = st.file_uploader("Calendar File", type=["ics"])
+
+            if st.form_submit_button("Import Events", type="primary") and ics_file:
+                import_calendar(ics_file)
+
 def create_task(name, module, cat_tag, day, t_start, t_end, notes):
     start_dt = datetime.combine(day, t_start)
     end_dt = datetime.combine(day, t_end)
@@ -284,10 +299,24 @@ def create_task(name, module, cat_tag, day, t_start, t_end, notes):
         "notes": notes
     }
     st.session_state.tasks.append(new_task)
-    save_tasks(st.session_state.tasks)
+    add_task(st.session_state.stats, new_task)
+    save_tasks(st.session_state.tasks, st.session_state.stats)
     st.success("Added to Calendar!")
     time.sleep(0.5)
 
+def import_calendar(ics_file):
+    # Events stream straight from the upload; everything is saved in one write
+    try:
+        imported, skipped = parse_ics_file(ics_file)
+    except ValueError as e:
+        st.error(f"Could not read this calendar file: {e}")
+        return
+    added = merge_imported_tasks(st.session_state.tasks, imported, st.session_state.stats)
+    save_tasks(st.session_state.tasks, st.session_state.stats)
+    st.success(f"Imported {len(added)} new event(s).")
+    if skipped:
+        st.warning(f"Skipped {len(skipped)} event(s) that could not be read: {', '.join(skipped[:5])}")
+
 # ==========================================
 # 📅 VIEW 3: CALENDAR
 # ==========================================
@@ -357,16 +386,19 @@ def edit_dialog(task):
 
         c3, c4 = st.columns(2)
         if c3.form_submit_button("💾 Save Changes", type="primary"):
+            remove_task(st.session_state.stats, task)
             task['name'] = new_name
             task['notes'] = new_notes
             task['start_time'] = datetime.combine(s_dt.date(), new_start).isoformat()
             task['end_time'] = datetime.combine(s_dt.date(), new_end).isoformat()
-            save_tasks(st.session_state.tasks)
+            add_task(st.session_state.stats, task)
+            save_tasks(st.session_state.tasks, st.session_state.stats)
             st.rerun()
 
         if c4.form_submit_button("🗑️ Delete Event", type="secondary"):
             st.session_state.tasks.remove(task)
-            save_tasks(st.session_state.tasks)
+            remove_task(st.session_state.stats, task)
+            save_tasks(st.session_state.tasks, st.session_state.stats)
             st.rerun()
 
 # ==========================================
@@ -411,14 +443,16 @@ def generate_stochastic_plan(goal, start_d, end_d, intensity, rhythm):
             verb = random.choice(verbs)
             name = f"{verb}: {goal}"
             end_t = curr_t + timedelta(minutes=50)
-            st.session_state.tasks.append({
+            new_task = {
                 "id": str(int(time.time()) + random.randint(1,9999)),
                 "name": name, "module": "Self-Study", "priority": "high", "completed": False,
                 "start_time": curr_t.isoformat(), "end_time": end_t.isoformat(), "notes": "AI Gen"
-            })
+            }
+            st.session_state.tasks.append(new_task)
+            add_task(st.session_state.stats, new_task)
             curr_t = end_t + timedelta(minutes=10)
         curr += timedelta(days=1)
-    save_tasks(st.session_state.tasks)
+    save_tasks(st.session_state.tasks, st.session_state.stats)
 
 def load_sample_data():
     today = date.today()
@@ -431,12 +465,14 @@ def load_sample_data():
     for s in sample:
         s_dt = datetime.combine(today, datetime.strptime(s['s'], "%H:%M").time())
         e_dt = datetime.combine(today, datetime.strptime(s['e'], "%H:%M").time())
-        st.session_state.tasks.append({
+        new_task = {
             "id": str(int(time.time()) + random.randint(1,999)),
             "name": s['name'], "module": s['cat'], "completed": False,
             "start_time": s_dt.isoformat(), "end_time": e_dt.isoformat(), "notes": "Demo"
-        })
-    save_tasks(st.session_state.tasks)
+        }
+        st.session_state.tasks.append(new_task)
+        add_task(st.session_state.stats, new_task)
+    save_tasks(st.session_state.tasks, st.session_state.stats)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
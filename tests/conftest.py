@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+# Same path fix as the app entry points: make the 'app' package importable
+root_path = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_path))
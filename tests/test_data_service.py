@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+from app.backend import data_service
+from app.backend.stats_service import build_stats
+
+
+@pytest.fixture(autouse=True)
+def data_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_service, "DATA_FILE", str(tmp_path / "tasks.json"))
+    monkeypatch.setattr(data_service, "STATS_FILE", str(tmp_path / "stats.json"))
+    return tmp_path
+
+
+def make_tasks():
+    return [{"id": "1", "name": "EXAM: Maths", "module": "Exam", "completed": False,
+             "start_time": "2026-02-19T09:00:00", "end_time": "2026-02-19T11:00:00"}]
+
+
+def test_saved_stats_are_reused():
+    tasks = make_tasks()
+    stats = build_stats(tasks)
+    data_service.save_tasks(tasks, stats)
+
+    loaded = data_service.load_stats(data_service.load_tasks())
+
+    assert loaded == stats
+    assert "fingerprint" in loaded
+
+
+def test_stats_rebuilt_when_tasks_change_without_stats():
+    tasks = make_tasks()
+    data_service.save_tasks(tasks, build_stats(tasks))
+
+    # Same task count, different content (e.g. hand-edited file or a crash before the stats write)
+    tasks[0]['completed'] = True
+    data_service.save_tasks(tasks)
+
+    loaded = data_service.load_stats(data_service.load_tasks())
+    assert loaded["completed"] == 1
+    assert loaded["by_module"] == {}
+
+
+def test_stats_rebuilt_when_keys_missing(data_files):
+    tasks = make_tasks()
+    data_service.save_tasks(tasks, build_stats(tasks))
+    stored = json.loads((data_files / "stats.json").read_text())
+    del stored["by_module"]
+    (data_files / "stats.json").write_text(json.dumps(stored))
+
+    loaded = data_service.load_stats(data_service.load_tasks())
+
+    assert loaded["by_module"] == {"Exam": 1}
+
+
+def test_save_leaves_no_temp_files(data_files):
+    tasks = make_tasks()
+    data_service.save_tasks(tasks, build_stats(tasks))
+
+    assert sorted(p.name for p in data_files.iterdir()) == ["stats.json", "tasks.json"]
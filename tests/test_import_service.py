@@ -0,0 +1,180 @@
+from datetime import datetime
+
+import pytest
+
+from app.backend.import_service import MAX_OCCURRENCES, infer_module, merge_imported_tasks, parse_ics_file
+from app.backend.stats_service import build_stats
+
+
+def make_ics(*events):
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0"]
+    for e in events:
+        lines += ["BEGIN:VEVENT", *e, "END:VEVENT"]
+    lines.append("END:VCALENDAR")
+    return "\r\n".join(lines).encode("utf-8")
+
+
+def ids(tasks):
+    return [t["id"] for t in tasks]
+
+
+def test_folded_lines_are_joined_before_decoding():
+    title = "Prüfung Übung".encode("utf-8")
+    # Fold in the middle of the two-byte "ü"
+    cut = title.index("ü".encode("utf-8")) + 1
+    data = (b"BEGIN:VCALENDAR\r\nBEGIN:VEVENT\r\nUID:f1\r\nSUMMARY:" + title[:cut]
+            + b"\r\n " + title[cut:] + b"\r\nDTSTART:20260105T090000\r\nEND:VEVENT\r\nEND:VCALENDAR\r\n")
+
+    # An uploaded file is iterated line by line as bytes
+    tasks, skipped = parse_ics_file(data.splitlines(keepends=True))
+
+    assert skipped == []
+    assert tasks[0]["name"] == "Prüfung Übung"
+
+
+def test_all_day_event_spans_whole_day():
+    tasks, _ = parse_ics_file(make_ics(["UID:a1", "SUMMARY:Reading Week", "DTSTART;VALUE=DATE:20260601"]))
+
+    assert tasks[0]["start_time"] == "2026-06-01T00:00:00"
+    assert tasks[0]["end_time"] == "2026-06-02T00:00:00"
+
+
+def test_quoted_parameter_may_contain_colon():
+    tasks, _ = parse_ics_file(make_ics(
+        ["UID:q1", "SUMMARY:Seminar", "DTSTART:20260105T090000",
+         'DESCRIPTION;ALTREP="http://x.org/a":Real text']))
+
+    assert tasks[0]["notes"] == "Real text"
+
+
+def test_duration_sets_end_time():
+    tasks, _ = parse_ics_file(make_ics(["UID:d1", "SUMMARY:Lab", "DTSTART:20260105T140000", "DURATION:PT1H30M"]))
+
+    assert tasks[0]["end_time"] == "2026-01-05T15:30:00"
+
+
+def test_exdate_removes_occurrence():
+    tasks, _ = parse_ics_file(make_ics(
+        ["UID:w1", "SUMMARY:Lecture", "DTSTART:20260105T090000", "RRULE:FREQ=WEEKLY;COUNT=3",
+         "EXDATE:20260112T090000"]))
+
+    assert ids(tasks) == ["ics:w1|2026-01-05T09:00:00", "ics:w1|2026-01-19T09:00:00"]
+
+
+def test_open_ended_rule_is_expanded_from_today():
+    tasks, _ = parse_ics_file(make_ics(
+        ["UID:o1", "SUMMARY:Tutorial", "DTSTART:20200106T090000", "RRULE:FREQ=WEEKLY"]))
+
+    today = datetime.now().date().isoformat()
+    assert tasks
+    assert all(t["start_time"][:10] >= today for t in tasks)
+
+
+def test_recurrence_id_override_replaces_occurrence():
+    tasks, _ = parse_ics_file(make_ics(
+        ["UID:w1", "SUMMARY:Lecture", "DTSTART:20260105T090000", "RRULE:FREQ=WEEKLY;COUNT=2"],
+        ["UID:w1", "RECURRENCE-ID:20260112T090000", "SUMMARY:Lecture (Room change)",
+         "DTSTART:20260113T100000", "DURATION:PT1H"]))
+
+    merged = []
+    merge_imported_tasks(merged, tasks)
+
+    assert len(merged) == 2
+    moved = next(t for t in merged if t["id"] == "ics:w1|2026-01-12T09:00:00")
+    assert moved["name"] == "Lecture (Room change)"
+    assert moved["start_time"] == "2026-01-13T10:00:00"
+
+
+def test_cancelled_instance_is_not_imported():
+    ics = make_ics(
+        ["UID:w1", "SUMMARY:Lecture", "DTSTART:20260105T090000", "RRULE:FREQ=WEEKLY;COUNT=4"],
+        ["UID:w1", "RECURRENCE-ID:20260112T090000", "STATUS:CANCELLED", "SUMMARY:Lecture",
+         "DTSTART:20260112T090000"])
+
+    merged = []
+    added = merge_imported_tasks(merged, parse_ics_file(ics)[0])
+
+    assert "ics:w1|2026-01-12T09:00:00" not in ids(merged)
+    assert len(merged) == len(added) == 3
+
+
+def test_cancelled_instance_removes_earlier_import():
+    master = ["UID:w1", "SUMMARY:Lecture", "DTSTART:20260105T090000", "RRULE:FREQ=WEEKLY;COUNT=4"]
+    tasks = []
+    merge_imported_tasks(tasks, parse_ics_file(make_ics(master))[0])
+    stats = build_stats(tasks)
+
+    cancel = ["UID:w1", "RECURRENCE-ID:20260112T090000", "STATUS:CANCELLED", "DTSTART:20260112T090000"]
+    added = merge_imported_tasks(tasks, parse_ics_file(make_ics(master, cancel))[0], stats)
+
+    assert added == []
+    assert "ics:w1|2026-01-12T09:00:00" not in ids(tasks)
+    assert stats == build_stats(tasks)
+
+
+def test_cancelled_series_removes_earlier_import():
+    master = ["UID:w1", "SUMMARY:Lecture", "DTSTART:20260105T090000", "RRULE:FREQ=WEEKLY;COUNT=4"]
+    other = ["UID:x1", "SUMMARY:Exam", "DTSTART:20260601T090000"]
+    tasks = []
+    merge_imported_tasks(tasks, parse_ics_file(make_ics(master, other))[0])
+    stats = build_stats(tasks)
+
+    added = merge_imported_tasks(tasks, parse_ics_file(make_ics(master + ["STATUS:CANCELLED"], other))[0], stats)
+
+    assert added == []
+    assert ids(tasks) == ["ics:x1"]
+    assert stats == build_stats(tasks)
+
+
+def test_reimport_dedupes_by_uid():
+    ics = make_ics(["UID:e1", "SUMMARY:Exam", "DTSTART:20260601T090000"],
+                   ["UID:e1", "SUMMARY:Exam (duplicate)", "DTSTART:20260601T090000"])
+    tasks = [{"id": "local", "name": "Essay", "module": "Self-Study", "completed": False,
+              "start_time": "2026-06-01T14:00:00"}]
+
+    first = merge_imported_tasks(tasks, parse_ics_file(ics)[0])
+    second = merge_imported_tasks(tasks, parse_ics_file(ics)[0])
+
+    assert ids(first) == ["ics:e1"]
+    assert first[0]["name"] == "Exam"
+    assert second == []
+    assert ids(tasks) == ["local", "ics:e1"]
+
+
+def test_malformed_events_are_skipped():
+    tasks, skipped = parse_ics_file(make_ics(
+        ["UID:b1", "SUMMARY:Bad Date", "DTSTART:2026-01-05"],
+        ["UID:b2", "SUMMARY:Bad Rule", "DTSTART:20260105T090000", "RRULE:FREQ=SOMETIMES"],
+        ["UID:g1", "SUMMARY:Good", "DTSTART:20260105T090000"]))
+
+    assert ids(tasks) == ["ics:g1"]
+    assert skipped == ["Bad Date", "Bad Rule"]
+
+
+def test_zero_interval_is_skipped():
+    tasks, skipped = parse_ics_file(make_ics(
+        ["UID:z1", "SUMMARY:Forever", "DTSTART:20260105T090000", "RRULE:FREQ=WEEKLY;INTERVAL=0"]))
+
+    assert tasks == []
+    assert skipped == ["Forever"]
+
+
+@pytest.mark.parametrize("rule", ["FREQ=MINUTELY;COUNT=100000", "FREQ=DAILY;UNTIL=29991231T000000", "FREQ=MINUTELY"])
+def test_recurrence_expansion_is_capped(rule):
+    tasks, _ = parse_ics_file(make_ics(["UID:m1", "SUMMARY:Spam", "DTSTART:20260105T090000", f"RRULE:{rule}"]))
+
+    assert len(tasks) == MAX_OCCURRENCES
+
+
+def test_non_calendar_file_raises():
+    with pytest.raises(ValueError):
+        parse_ics_file(b"name,start\nEssay,2026-01-05\n")
+
+
+def test_infer_module_matches_whole_words():
+    assert infer_module("Final Exam: Physics") == "Exam"
+    assert infer_module("CS101 Lectures") == "Lecture"
+    assert infer_module("Morning Run") == "Gym"
+    for title in ["Team Brunch", "Truncate", "Latest news", "Example problems",
+                  "Collaboration meeting", "Classic film night"]:
+        assert infer_module(title) == "Other", title
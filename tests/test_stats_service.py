@@ -0,0 +1,47 @@
+from app.backend.stats_service import add_task, build_stats, empty_stats, remove_task
+
+
+def make_task(task_id, module="Lecture", day="2026-02-19", completed=False):
+    return {"id": task_id, "name": task_id, "module": module, "completed": completed,
+            "start_time": f"{day}T09:00:00", "end_time": f"{day}T10:00:00"}
+
+
+def test_add_complete_edit_delete_match_full_rebuild():
+    tasks = []
+    stats = empty_stats()
+    for i, module in enumerate(["Lecture", "Exam", "Gym", "Exam"]):
+        t = make_task(str(i), module, day=f"2026-02-{19 + i % 2}")
+        tasks.append(t)
+        add_task(stats, t)
+    assert stats == build_stats(tasks)
+
+    # Complete
+    remove_task(stats, tasks[1])
+    tasks[1]['completed'] = True
+    add_task(stats, tasks[1])
+    assert stats == build_stats(tasks)
+
+    # Edit date and module
+    remove_task(stats, tasks[2])
+    tasks[2]['module'] = "Break"
+    tasks[2]['start_time'] = "2026-03-01T12:00:00"
+    add_task(stats, tasks[2])
+    assert stats == build_stats(tasks)
+
+    # Delete
+    t = tasks.pop(0)
+    remove_task(stats, t)
+    assert stats == build_stats(tasks)
+
+    assert stats["total"] == 3
+    assert stats["completed"] == 1
+    assert stats["by_module"] == {"Exam": 1, "Break": 1}
+
+
+def test_zero_counts_are_pruned():
+    stats = empty_stats()
+    t = make_task("1", "Exam")
+    add_task(stats, t)
+    remove_task(stats, t)
+
+    assert stats == empty_stats()